@@ -8,11 +8,29 @@ import os
 import shutil
 from datetime import datetime
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+    
+    def _dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    
+    def _dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 # Configuration
 PLUGIN_DIR = r"C:\Users\Shadow\AppData\Local\EDMarketConnector\plugins\SHBOXSEARCH"
 INPUT_FILES = ['neareststars.json', 'galacticmapping.json', 'gecmapping.json']
 OUTPUT_FILE = 'neareststars.json'
 BACKUP_SUFFIX = '.backup'
+PRETTY_OUTPUT = False  # Indent output (about twice the size and write time)
+WRITE_BUFFER_SIZE = 1 << 20
 
 def load_json_file(filepath):
     """Load and parse a JSON file."""
@@ -20,46 +38,43 @@ def load_json_file(filepath):
         return None
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return _loads(f.read())
     except Exception as e:
         print(f"❌ Error loading {filepath}: {e}")
         return None
 
+REQUIRED_KEYS = ('Name', 'X', 'Y', 'Z')
+
 def parse_neareststars_format(data, systems):
     """Parse EDDiscovery neareststars.json format."""
     if not isinstance(data, dict) or 'Nearest' not in data:
         return 0
     
-    count = 0
+    before = len(systems)
     for sys in data.get('Nearest', []):
-        if not all(k in sys for k in ['Name', 'X', 'Y', 'Z']):
+        name = sys.get('Name')
+        if name in systems or not all(k in sys for k in REQUIRED_KEYS):
             continue
         
-        name = sys['Name']
-        if name not in systems:
-            systems[name] = {
-                'Name': name,
-                'X': float(sys['X']),
-                'Y': float(sys['Y']),
-                'Z': float(sys['Z'])
-            }
-            count += 1
-    
-    return count
+        systems[name] = {
+            'Name': name,
+            'X': float(sys['X']),
+            'Y': float(sys['Y']),
+            'Z': float(sys['Z'])
+        }
+    
+    return len(systems) - before
 
 def parse_mapping_format(data, systems):
     """Parse galacticmapping.json / gecmapping.json format."""
     if not isinstance(data, list):
         return 0
     
-    count = 0
+    before = len(systems)
     for entry in data:
-        if 'coordinates' not in entry:
-            continue
-        
-        coords = entry['coordinates']
-        if len(coords) < 3:
+        coords = entry.get('coordinates')
+        if not coords or len(coords) < 3:
             continue
         
         # Try to get system name
@@ -73,9 +88,24 @@ def parse_mapping_format(data, systems):
             'Y': float(coords[1]),
             'Z': float(coords[2])
         }
-        count += 1
     
-    return count
+    return len(systems) - before
+
+def write_combined(output_path, header, systems, pretty=False):
+    """Write the combined database, one system record at a time."""
+    with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        if pretty:
+            f.write(_dumps_pretty({'System': header, 'Nearest': list(systems)}))
+            return
+        
+        f.write(b'{"System":')
+        f.write(_dumps(header))
+        f.write(b',"Nearest":[\n')
+        for i, sys in enumerate(systems):
+            if i:
+                f.write(b',\n')
+            f.write(_dumps(sys))
+        f.write(b'\n]}\n')
 
 def combine_json_files(plugin_dir, input_files, output_file):
     """Combine multiple JSON files into one neareststars.json format."""
@@ -141,19 +171,20 @@ def combine_json_files(plugin_dir, input_files, output_file):
         print(f"💾 Backup created: {os.path.basename(backup_path)}")
     
     # Create combined output
-    combined = {
-        'System': {
-            'Name': 'Combined Database',
-            'X': 0.0,
-            'Y': 0.0,
-            'Z': 0.0
-        },
-        'Nearest': sorted(systems.values(), key=lambda s: s['Name'])
+    header = {
+        'Name': 'Combined Database',
+        'X': 0.0,
+        'Y': 0.0,
+        'Z': 0.0
     }
     
     # Write output file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(combined, f, indent=2, ensure_ascii=False)
+    write_combined(
+        output_path,
+        header,
+        sorted(systems.values(), key=lambda s: s['Name']),
+        pretty=PRETTY_OUTPUT
+    )
     
     print()
     print(f"✅ Successfully created: {output_file}")
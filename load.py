@@ -14,25 +14,76 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import math
 import os
+import queue
 import sqlite3
+import struct
 import threading
 import time
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from sys import intern
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import tkinter as tk
 from tkinter import ttk, filedialog
 
+# Optional acceleration (not bundled with every EDMC build)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+    import httpx
+except ImportError:
+    httpx = None
+
 # EDMC public API imports
 import myNotebook as nb
 from config import appname, config
 from theme import theme
 from ttkHyperlinkLabel import HyperlinkLabel
 
+try:
+    from monitor import monitor as _monitor
+except ImportError:
+    _monitor = None
+
 # Logging setup
 import logging
 plugin_name = os.path.basename(os.path.dirname(__file__))
@@ -47,6 +98,7 @@ if not logger.hasHandlers():
     formatter.default_msec_format = "%s.%03d"
     ch.setFormatter(formatter)
     logger.addHandler(ch)
+_default_log_level = logger.level  # restored when "Debug logging" is unticked
 
 # ============================================================================
 # Version & Constants
@@ -55,12 +107,34 @@ VERSION = "3.0.7"
 VERSION_DATE = "2025-12-25"
 
 STATE_FILE = os.path.join(os.path.dirname(__file__), "survey_state.json")
+SYSTEMS_FILE = os.path.join(os.path.dirname(__file__), "survey_systems.bin")
+PROGRESS_FILE = os.path.join(os.path.dirname(__file__), "survey_progress.log")
 
 # API Endpoints
 EDSM_BASE = "https://www.edsm.net"
 EDSM_SPHERE = "/api-v1/sphere-systems"
 EDSM_CUBE = "/api-v1/cube-systems"
 EDSM_SYSTEM = "/api-v1/system"
+EDSM_CUBE_SIZE = 200  # ly, EDSM maximum for cube-systems
+EDSM_TILE_SPACING = EDSM_CUBE_SIZE  # ly between tile centres; cubes touch without overlapping
+EDSM_TILE_WORKERS = 4  # concurrent cube tile requests; kept low to stay polite to EDSM
+EDSM_SPHERE_ATTEMPTS = 2  # sphere retries before falling back to cube tiling
+# Per-request retries, used by the requests adapter and the HTTP/2 tile fetch
+EDSM_TILE_ATTEMPTS = 3
+EDSM_RETRY_BACKOFF = 0.3  # seconds, doubled after each attempt
+EDSM_RETRY_STATUSES = (429, 500, 502, 503, 504)
+EDSM_MAX_RETRY_AFTER = 60  # seconds; longest Retry-After honoured
+EDSM_SPHERE_MAX_RADIUS = 100  # ly, EDSM caps sphere-systems at this radius
+EDSM_CACHE_FILE = os.path.join(os.path.dirname(__file__), "edsm_cache")  # requests-cache (optional)
+EDSM_CACHE_TTL = 3600  # seconds
+EDSM_RESULT_CACHE_SIZE = 64
+# Parsed query results survive restarts, one file per query; star positions do not move
+EDSM_RESULT_DIR = os.path.join(os.path.dirname(__file__), "edsm_results")
+EDSM_RESULT_TTL = 7 * 24 * 3600  # seconds
+
+# Spatial index over the EDDiscovery systems table. Kept in the plugin folder
+# so the EDDiscovery database itself is never written to.
+EDD_RTREE_FILE = os.path.join(os.path.dirname(__file__), "edd_rtree.sqlite")
 
 SPANSH_BASE = "https://spansh.co.uk"
 SPANSH_NEAREST = "/api/nearest"
@@ -82,9 +156,11 @@ CFG_PREFER_SHORT_JUMPS = f"{plugin_name}_prefer_short"
 # Data Structures
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True)
 class SystemNode:
     """Represents a star system."""
+    __slots__ = ('name', 'id64', 'x', 'y', 'z', 'distance', '_hash')
+    
     name: str
     id64: Optional[int]
     x: float
@@ -92,8 +168,12 @@ class SystemNode:
     z: float
     distance: float  # from start system
     
+    def __post_init__(self):
+        # Nodes are looked up in sets/dicts on every jump; hash once
+        object.__setattr__(self, '_hash', hash((self.name, self.id64)))
+    
     def __hash__(self):
-        return hash((self.name, self.id64))
+        return self._hash
     
     def __eq__(self, other):
         if not isinstance(other, SystemNode):
@@ -102,6 +182,229 @@ class SystemNode:
             return self.id64 == other.id64
         return self.name == other.name
 
+def _intern_name(name):
+    """Share one string object per system name across nodes, dicts and sets."""
+    return intern(name) if type(name) is str else name
+
+class SortedIdSet:
+    """Compact set of id64 values: a sorted int64 array searched by bisection.
+    
+    Uses 8 bytes per id instead of a Python int object plus a hash slot.
+    """
+    __slots__ = ('_ids',)
+    
+    def __init__(self, ids: Iterable[int] = ()):
+        self._ids = array('q', sorted(set(ids)))
+    
+    def __contains__(self, id64) -> bool:
+        i = bisect_left(self._ids, id64)
+        return i < len(self._ids) and self._ids[i] == id64
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+    
+    def add(self, id64: int) -> None:
+        i = bisect_left(self._ids, id64)
+        if i == len(self._ids) or self._ids[i] != id64:
+            self._ids.insert(i, id64)
+    
+    def clear(self) -> None:
+        self._ids = array('q')
+
+class PendingSystems:
+    """Systems still to visit, in the order they were queued.
+    
+    Rows are never deleted: visiting a system clears its mask bit, so the
+    coordinate array and the k-d tree (with SciPy) built when the survey
+    starts stay valid for the whole survey.
+    """
+    __slots__ = ('_nodes', '_alive', '_count', '_rows', '_bounds', '_queue', '_xyz', '_tree', '_d2', '_grid', 'version')
+    
+    def __init__(self, nodes: Iterable[SystemNode] = ()):
+        self._nodes = list(nodes)
+        n = len(self._nodes)
+        self._count = n
+        self.version = 0  # bumped whenever a row is discarded
+        # Row lookup for discard(): names and id64s share one dict (str vs int keys)
+        self._rows: Dict[Any, List[int]] = {}
+        for i, s in enumerate(self._nodes):
+            self._rows.setdefault(s.name, []).append(i)
+            if s.id64:
+                self._rows.setdefault(s.id64, []).append(i)
+        # Bounding box of all rows: ((min x, max x), (min y, max y), (min z, max z))
+        self._bounds = tuple(
+            (min(axis), max(axis)) for axis in zip(*((s.x, s.y, s.z) for s in self._nodes))
+        )
+        self._queue = None  # rows by distance from start, built on first use
+        self._grid = None  # (cell size, {cell: [row, ...]}) for the stdlib path
+        self._xyz = None
+        self._tree = None
+        self._d2 = None
+        if np is not None:
+            self._alive = np.ones(n, dtype=bool)
+            self._xyz = np.array([(s.x, s.y, s.z) for s in self._nodes], dtype=np.float64).reshape(-1, 3)
+            if cKDTree is not None and n:
+                self._tree = cKDTree(self._xyz)
+        else:
+            self._alive = [True] * n
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __bool__(self) -> bool:
+        return self._count > 0
+    
+    def __iter__(self) -> Iterator[SystemNode]:
+        alive = self._alive
+        return (s for i, s in enumerate(self._nodes) if alive[i])
+    
+    def closest_to_start(self) -> Optional[SystemNode]:
+        """Pending system with the smallest distance from the survey start."""
+        queue = self._queue
+        if queue is None:
+            # Sources usually return rows sorted by distance already, which
+            # the stable sort detects in a single pass
+            nodes = self._nodes
+            queue = self._queue = deque(sorted(range(len(nodes)), key=lambda i: nodes[i].distance))
+        # Visited rows are dropped lazily when they reach the front
+        alive = self._alive
+        while queue and not alive[queue[0]]:
+            queue.popleft()
+        return self._nodes[queue[0]] if queue else None
+    
+    def discard(self, name: Optional[str], id64: Optional[int] = None) -> None:
+        """Drop every pending row matching the name (or id64, if given)."""
+        alive = self._alive
+        rows = self._rows.pop(name, [])
+        if id64:
+            rows = rows + self._rows.pop(id64, [])
+        for i in rows:
+            if alive[i]:
+                alive[i] = False
+                self._count -= 1
+                self.version += 1
+    
+    def nearest(self, x: float, y: float, z: float, max_dist: Optional[float] = None) -> Optional[SystemNode]:
+        """Closest pending system to (x, y, z).
+        
+        Only systems within max_dist are considered when any exist; otherwise
+        the closest pending system overall is returned.
+        """
+        if not self._count:
+            return None
+        if max_dist and self._within_reach(x, y, z, max_dist * max_dist):
+            max_dist = None  # every row is in range; no filtering needed
+        if self._tree is not None:
+            return self._nearest_tree((x, y, z), max_dist)
+        # The range test compares squared distances; square the limit once per pick
+        max_sq = max_dist * max_dist if max_dist else None
+        if self._xyz is not None:
+            return self._nearest_array(x, y, z, max_sq)
+        
+        # Squared distance orders the same as distance; no sqrt needed
+        def sq_dist_from_current(sys: SystemNode) -> float:
+            dx = sys.x - x
+            dy = sys.y - y
+            dz = sys.z - z
+            return dx*dx + dy*dy + dz*dz
+        
+        if max_dist:
+            found = self._nearest_grid(x, y, z, max_dist, max_sq)
+            if found is not None:
+                return found
+        # Nothing within range: closest pending system overall
+        return min(self, key=sq_dist_from_current)
+    
+    def _within_reach(self, x: float, y: float, z: float, max_sq: float) -> bool:
+        """True if even the farthest corner of the bounding box is within range."""
+        far_sq = 0.0
+        for c, (lo, hi) in zip((x, y, z), self._bounds):
+            d = max(c - lo, hi - c)
+            far_sq += d * d
+        return far_sq <= max_sq
+    
+    def _nearest_grid(self, x: float, y: float, z: float, max_dist: float, max_sq: float) -> Optional[SystemNode]:
+        # Uniform grid with one jump range per cell: everything in range lies
+        # in the 27 cells around the current one
+        cell = max_dist
+        if self._grid is None or self._grid[0] != cell:
+            grid: Dict[Tuple[int, int, int], List[int]] = {}
+            for i, s in enumerate(self._nodes):
+                grid.setdefault((int(s.x // cell), int(s.y // cell), int(s.z // cell)), []).append(i)
+            self._grid = (cell, grid)
+        grid = self._grid[1]
+        
+        nodes = self._nodes
+        alive = self._alive
+        gx, gy, gz = int(x // cell), int(y // cell), int(z // cell)
+        best = None  # (squared distance, row); the row breaks ties in queue order
+        for cx in (gx - 1, gx, gx + 1):
+            for cy in (gy - 1, gy, gy + 1):
+                for cz in (gz - 1, gz, gz + 1):
+                    for i in grid.get((cx, cy, cz), ()):
+                        if not alive[i]:
+                            continue
+                        s = nodes[i]
+                        dx = s.x - x
+                        dy = s.y - y
+                        dz = s.z - z
+                        d2 = dx*dx + dy*dy + dz*dz
+                        if d2 <= max_sq and (best is None or (d2, i) < best):
+                            best = (d2, i)
+        return nodes[best[1]] if best is not None else None
+    
+    def _nearest_array(self, x: float, y: float, z: float, max_sq: Optional[float]) -> Optional[SystemNode]:
+        # Work buffers live as long as the survey, so a pick allocates nothing per row
+        if self._d2 is None:
+            n = len(self._nodes)
+            self._d2 = (np.empty(n), np.empty(n), np.empty((n, 3)), np.empty(n, dtype=bool), np.empty(3))
+        d2, ranked, delta, mask, point = self._d2
+        
+        # Squared distances for every row at once
+        if _sq_dist_kernel is not None:
+            _sq_dist_kernel(self._xyz, self._alive, x, y, z, d2)
+        else:
+            point[0] = x
+            point[1] = y
+            point[2] = z
+            np.subtract(self._xyz, point, out=delta)
+            np.einsum('ij,ij->i', delta, delta, out=d2)
+            np.logical_not(self._alive, out=mask)
+            np.copyto(d2, np.inf, where=mask)
+        if max_sq:
+            np.greater(d2, max_sq, out=mask)
+            np.copyto(ranked, d2)
+            np.copyto(ranked, np.inf, where=mask)
+            i = int(np.argmin(ranked))
+            if np.isfinite(ranked[i]):
+                return self._nodes[i]
+        i = int(np.argmin(d2))
+        return self._nodes[i] if np.isfinite(d2[i]) else None
+    
+    def _nearest_tree(self, point: Tuple[float, float, float], max_dist: Optional[float]) -> Optional[SystemNode]:
+        alive = self._alive
+        if max_dist:
+            idx = np.asarray(self._tree.query_ball_point(point, r=max_dist), dtype=np.intp)
+            idx = np.sort(idx[alive[idx]])
+            if len(idx):
+                d2 = ((self._xyz[idx] - point) ** 2).sum(axis=1)
+                return self._nodes[int(idx[np.argmin(d2)])]
+        # Nothing in range: widen the k-nearest query until a pending row shows up
+        n = len(self._nodes)
+        k = min(n, 16)
+        while True:
+            _, idx = self._tree.query(point, k=k)
+            idx = np.atleast_1d(idx)
+            live = idx[alive[idx]]
+            if len(live):
+                return self._nodes[int(live[0])]
+            if k >= n:
+                return None
+            k = min(n, k * 4)
+
 @dataclass
 class SurveyState:
     """Persistent survey state."""
@@ -113,8 +416,8 @@ class SurveyState:
     prefer_short_jumps: bool = True
     
     # Survey progress
-    pending_systems: List[SystemNode] = field(default_factory=list)
-    visited_ids: Set[int] = field(default_factory=set)
+    pending_systems: PendingSystems = field(default_factory=PendingSystems)
+    visited_ids: SortedIdSet = field(default_factory=SortedIdSet)
     visited_names: Set[str] = field(default_factory=set)
     all_systems: Dict[str, SystemNode] = field(default_factory=dict)
     
@@ -122,17 +425,211 @@ class SurveyState:
     started_ts: Optional[float] = None
     data_source_used: Optional[str] = None
     
+    # Set when the state files need rewriting, cleared once handed to the writer;
+    # systems_dirty also rewrites the system list, dirty alone only the metadata
+    dirty: bool = False
+    systems_dirty: bool = False
+    # Visits since the last write, appended to the progress log
+    visits: List[Tuple[Optional[int], str]] = field(default_factory=list)
+    
     def reset(self) -> None:
         """Reset survey state."""
         self.active = False
         self.start_system = None
         self.start_coords = None
-        self.pending_systems.clear()
+        self.pending_systems = PendingSystems()
         self.visited_ids.clear()
         self.visited_names.clear()
         self.all_systems.clear()
         self.started_ts = None
         self.data_source_used = None
+        self.dirty = True
+        self.systems_dirty = True
+        self.visits.clear()
+
+if numba is not None and np is not None:
+    @numba.njit(fastmath=True, cache=True)
+    def _radius_kernel(xyz, cx, cy, cz, r, r2, out_idx, out_d):
+        """Single pass radius filter; writes matching rows and squared distances, returns count."""
+        k = 0
+        for i in range(xyz.shape[0]):
+            dx = xyz[i, 0] - cx
+            if abs(dx) > r:
+                continue
+            dy = xyz[i, 1] - cy
+            if abs(dy) > r:
+                continue
+            dz = xyz[i, 2] - cz
+            if abs(dz) > r:
+                continue
+            d2 = dx*dx + dy*dy + dz*dz
+            if d2 <= r2:
+                out_idx[k] = i
+                out_d[k] = d2
+                k += 1
+        return k
+    
+    @numba.njit(fastmath=True, cache=True)
+    def _sq_dist_kernel(xyz, alive, cx, cy, cz, out):
+        """Squared distance of every row to (cx, cy, cz); inf for dead rows."""
+        for i in range(xyz.shape[0]):
+            if alive[i]:
+                dx = xyz[i, 0] - cx
+                dy = xyz[i, 1] - cy
+                dz = xyz[i, 2] - cz
+                out[i] = dx*dx + dy*dy + dz*dz
+            else:
+                out[i] = np.inf
+else:
+    _radius_kernel = None
+    _sq_dist_kernel = None
+
+@dataclass
+class SystemTable:
+    """Column-oriented collection of systems (structure of arrays).
+    
+    Sources filter and sort whole tables and only create SystemNodes for the
+    rows that are actually handed out.
+    """
+    names: List[str]
+    ids: List[Optional[int]]
+    xyz: Any  # (N, 3) float32 ndarray with NumPy, otherwise list of (x, y, z)
+    distance: Any = None  # per-row distance, set by within_radius()
+    _buffers: Any = field(default=None, repr=False, compare=False)  # kernel output
+    
+    @classmethod
+    def from_columns(
+        cls,
+        names: List[str],
+        ids: List[Optional[int]],
+        coords: List[Tuple[float, float, float]]
+    ) -> SystemTable:
+        """Build a table, packing coordinates into a float32 array if NumPy is available."""
+        if np is not None:
+            return cls(names, ids, np.array(coords, dtype=np.float32).reshape(-1, 3))
+        return cls(names, ids, coords)
+    
+    @classmethod
+    def from_rows(cls, rows: List[Tuple]) -> SystemTable:
+        """Build a table from (name, x, y, z, id) rows as returned by SQLite."""
+        if np is not None:
+            arr = np.array(rows, dtype=[('name', 'O'), ('x', 'f4'), ('y', 'f4'), ('z', 'f4'), ('id', 'O')])
+            xyz = np.column_stack((arr['x'], arr['y'], arr['z']))
+            return cls(arr['name'].tolist(), arr['id'].tolist(), xyz)
+        if not rows:
+            return cls([], [], [])
+        names, xs, ys, zs, ids = zip(*rows)
+        return cls(list(names), list(ids), list(zip(xs, ys, zs)))
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def _take(self, rows: List[int]) -> SystemTable:
+        """Return a new table with the given rows, in that order."""
+        if np is not None and isinstance(self.xyz, np.ndarray):
+            idx = np.array(rows, dtype=np.intp)
+            xyz = self.xyz[idx]
+            distance = self.distance[idx] if self.distance is not None else None
+        else:
+            xyz = [self.xyz[i] for i in rows]
+            distance = [self.distance[i] for i in rows] if self.distance is not None else None
+        return SystemTable(
+            names=[self.names[i] for i in rows],
+            ids=[self.ids[i] for i in rows],
+            xyz=xyz,
+            distance=distance
+        )
+    
+    def within_radius(self, x: float, y: float, z: float, radius: float) -> SystemTable:
+        """Return the rows within radius of (x, y, z), sorted by distance."""
+        if np is not None and isinstance(self.xyz, np.ndarray):
+            if _radius_kernel is not None:
+                if self._buffers is None:
+                    n = len(self.xyz)
+                    self._buffers = (np.empty(n, dtype=np.intp), np.empty(n, dtype=np.float32))
+                out_idx, out_d = self._buffers
+                k = _radius_kernel(
+                    np.ascontiguousarray(self.xyz),
+                    np.float32(x), np.float32(y), np.float32(z),
+                    np.float32(radius), np.float32(radius * radius),
+                    out_idx, out_d
+                )
+                idx = out_idx[:k].copy()
+                d2 = out_d[:k].copy()
+            else:
+                # Cheap bounding-box test first; full distance only for rows inside it
+                delta = self.xyz - np.array([x, y, z], dtype=np.float32)
+                idx = np.nonzero((np.abs(delta) <= radius).all(axis=1))[0]
+                near = delta[idx]
+                d2 = np.einsum('ij,ij->i', near, near)
+                inside = d2 <= radius * radius
+                idx = idx[inside]
+                d2 = d2[inside]
+            # Squared distance orders the same as distance; sqrt only the survivors
+            order = np.argsort(d2, kind='stable')
+            table = self._take(idx[order].tolist())
+            table.distance = np.sqrt(d2[order])
+            return table
+        
+        r2 = radius * radius
+        rows = []
+        for i, (sx, sy, sz) in enumerate(self.xyz):
+            dx = sx - x
+            if dx > radius or dx < -radius:
+                continue
+            dy = sy - y
+            if dy > radius or dy < -radius:
+                continue
+            dz = sz - z
+            if dz > radius or dz < -radius:
+                continue
+            d2 = dx*dx + dy*dy + dz*dz
+            if d2 <= r2:
+                rows.append((d2, i))
+        rows.sort()  # (d2, row) tuples: by distance, ties in row order
+        table = self._take([i for _, i in rows])
+        table.distance = [math.sqrt(d2) for d2, _ in rows]
+        return table
+    
+    def deduplicated(self) -> SystemTable:
+        """Drop repeated systems, keeping the first row of each.
+        
+        Rows are keyed by id64; the name is only used when id64 is missing.
+        """
+        seen_names = set()
+        keep = []
+        if np is not None:
+            ids = np.array([i or 0 for i in self.ids], dtype=np.int64)
+            with_id = np.nonzero(ids)[0]
+            _, first = np.unique(ids[with_id], return_index=True)
+            keep = with_id[first].tolist()
+            for i in np.nonzero(ids == 0)[0].tolist():
+                if self.names[i] not in seen_names:
+                    seen_names.add(self.names[i])
+                    keep.append(i)
+            keep.sort()
+        else:
+            seen_ids = set()
+            for i, (name, sys_id) in enumerate(zip(self.names, self.ids)):
+                if sys_id:
+                    if sys_id in seen_ids:
+                        continue
+                    seen_ids.add(sys_id)
+                elif name in seen_names:
+                    continue
+                else:
+                    seen_names.add(name)
+                keep.append(i)
+        return self._take(keep)
+    
+    def iter_nodes(self):
+        """Yield a SystemNode per row."""
+        xyz = self.xyz.tolist() if np is not None and isinstance(self.xyz, np.ndarray) else self.xyz
+        distance = self.distance if self.distance is not None else [0.0] * len(self.names)
+        if np is not None and isinstance(distance, np.ndarray):
+            distance = distance.tolist()
+        for name, sys_id, (sx, sy, sz), dist in zip(self.names, self.ids, xyz, distance):
+            yield SystemNode(name=_intern_name(name), id64=sys_id, x=sx, y=sy, z=sz, distance=dist)
 
 # ============================================================================
 # API Abstraction
@@ -167,15 +664,59 @@ class SystemDataSource(ABC):
     def get_priority(self) -> int:
         """Get priority (lower = higher priority)."""
         pass
+    
+    def close(self) -> None:
+        """Release resources held by this source."""
+        pass
 
 
+@lru_cache(maxsize=16)
+def _tile_offsets(radius: float) -> Tuple[Tuple[int, int, int], ...]:
+    """Offsets (ly) of the cube tiles needed to cover a sphere of this radius.
+    
+    Depends only on the radius, so repeated queries reuse the grid.
+    """
+    half = EDSM_CUBE_SIZE / 2
+    # Outermost tile only has to reach the sphere surface
+    tiles_needed = max(0, int(math.ceil((radius - half) / EDSM_TILE_SPACING)))
+    
+    # Skip tiles whose closest point is outside the sphere
+    r2 = radius * radius
+    steps = range(-tiles_needed, tiles_needed + 1)
+    gap = {t: max(0.0, abs(t) * EDSM_TILE_SPACING - half) ** 2 for t in steps}
+    return tuple(
+        (tx * EDSM_TILE_SPACING, ty * EDSM_TILE_SPACING, tz * EDSM_TILE_SPACING)
+        for tx in steps for ty in steps for tz in steps
+        if gap[tx] + gap[ty] + gap[tz] <= r2
+    )
+
 class EDSMSource(SystemDataSource):
     """EDSM API - Reliable public API."""
     
     def __init__(self):
+        # Parsed results keyed by (x, y, z quantized to 0.1 ly, radius)
+        self._results: OrderedDict = OrderedDict()
+        self._results_lock = threading.Lock()
         try:
             import requests
-            self._session = requests.Session()
+            try:
+                from requests_cache import CachedSession
+                self._session = CachedSession(EDSM_CACHE_FILE, backend='sqlite', expire_after=EDSM_CACHE_TTL)
+            except ImportError:
+                self._session = requests.Session()
+            # One pooled keep-alive connection per tile worker; transient
+            # errors and rate limiting are retried with backoff
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            retry = Retry(
+                total=EDSM_TILE_ATTEMPTS - 1,
+                backoff_factor=EDSM_RETRY_BACKOFF,
+                status_forcelist=EDSM_RETRY_STATUSES,
+                allowed_methods=["GET"]
+            )
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=EDSM_TILE_WORKERS, max_retries=retry)
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
             self._session.headers.update({
                 'User-Agent': 'EDMC-SphereSurvey/3.0.1',
                 'Accept': 'application/json'
@@ -187,20 +728,107 @@ class EDSMSource(SystemDataSource):
         return self._session is not None
     
     def get_systems_near(self, x: float, y: float, z: float, radius: float, system_name: Optional[str] = None) -> Optional[List[SystemNode]]:
+        key = (round(x, 1), round(y, 1), round(z, 1), radius)
+        cached = self._cached_result(key)
+        if cached is not None:
+            logger.info(f"EDSM result cache hit: {len(cached)} systems")
+            return list(cached)
+        
         try:
-            # Try sphere query with coordinates (more reliable than by name)
-            systems = self._query_sphere_coords(x, y, z, radius)
+            # Try sphere query with coordinates (more reliable than by name).
+            # Failures are often transient (rate limiting), so retry with
+            # backoff before paying for a full cube tiling.
+            # Larger radii go straight to cube tiling, since the sphere
+            # endpoint would silently cut them down.
+            systems = None
+            if radius <= EDSM_SPHERE_MAX_RADIUS:
+                for attempt in range(EDSM_SPHERE_ATTEMPTS):
+                    systems = self._query_sphere_coords(x, y, z, radius)
+                    if systems:
+                        break
+                    if attempt + 1 < EDSM_SPHERE_ATTEMPTS:
+                        time.sleep(1.0 * (attempt + 1))
+                if not systems:
+                    logger.info("EDSM sphere query failed, trying cube tiling")
             
-            # Fallback to cube query if sphere fails
+            # Fallback to cube query if sphere fails or cannot cover the radius
+            complete = bool(systems)
             if not systems:
-                logger.info("EDSM sphere query failed, trying cube tiling")
-                systems = self._query_cube_tiled(x, y, z, radius)
+                systems, complete = self._query_cube_tiled(x, y, z, radius)
             
+            # A result missing failed tiles is used once but never cached
+            if systems and complete:
+                self._store_result(key, systems)
             return systems
         except Exception as e:
             logger.error(f"EDSM query failed: {e}", exc_info=True)
             return None
     
+    def _cached_result(self, key: Tuple) -> Optional[List[SystemNode]]:
+        with self._results_lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                ts, systems = entry
+                if time.time() - ts <= EDSM_RESULT_TTL:
+                    self._results.move_to_end(key)
+                    return systems
+                del self._results[key]
+        
+        entry = self._load_result(key)
+        if entry is None:
+            return None
+        with self._results_lock:
+            self._remember(key, entry)
+        return entry[1]
+    
+    def _remember(self, key: Tuple, entry: Tuple[float, List[SystemNode]]):
+        """Add an entry to the in-memory LRU. Caller holds the lock."""
+        self._results[key] = entry
+        self._results.move_to_end(key)
+        while len(self._results) > EDSM_RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+    
+    def _store_result(self, key: Tuple, systems: List[SystemNode]):
+        systems = list(systems)
+        with self._results_lock:
+            self._remember(key, (time.time(), systems))
+        
+        # Only this query's file is written; the oldest files beyond the
+        # cache size are removed
+        try:
+            os.makedirs(EDSM_RESULT_DIR, exist_ok=True)
+            _atomic_write(
+                self._result_path(key),
+                _encode_systems([(s.name, s.id64, s.x, s.y, s.z, s.distance, False) for s in systems])
+            )
+            with os.scandir(EDSM_RESULT_DIR) as it:
+                files = sorted((e.stat().st_mtime, e.path) for e in it if e.name.endswith('.bin'))
+            for _, path in files[:-EDSM_RESULT_CACHE_SIZE]:
+                os.remove(path)
+        except Exception as e:
+            logger.warning(f"Failed to write EDSM cache: {e}")
+    
+    @staticmethod
+    def _result_path(key: Tuple) -> str:
+        x, y, z, radius = key
+        return os.path.join(EDSM_RESULT_DIR, f"{x:.1f}_{y:.1f}_{z:.1f}_{radius:g}.bin")
+    
+    def _load_result(self, key: Tuple) -> Optional[Tuple[float, List[SystemNode]]]:
+        """Read one cached result from disk, unless it has expired."""
+        path = self._result_path(key)
+        try:
+            with open(path, 'rb') as f:
+                ts = os.fstat(f.fileno()).st_mtime
+                if time.time() - ts > EDSM_RESULT_TTL:
+                    return None
+                buf = f.read()
+            return ts, [node for node, _ in _decode_systems(buf)]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable EDSM cache {path}: {e}")
+            return None
+    
     def _query_sphere_coords(self, x: float, y: float, z: float, radius: float) -> Optional[List[SystemNode]]:
         """Query EDSM sphere by coordinates."""
         try:
@@ -210,14 +838,15 @@ class EDSMSource(SystemDataSource):
                 'y': y,
                 'z': z,
                 'radius': radius,
-                'showCoordinates': 1
+                'showCoordinates': 1,
+                'showId': 1
             }
             
             logger.info(f"EDSM Sphere Query: {url} with radius {radius}")
             
             response = self._session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = _json_loads(response.content)
             
             # EDSM returns dict with error if no systems found or parameters invalid
             if isinstance(data, dict):
@@ -235,34 +864,27 @@ class EDSMSource(SystemDataSource):
                 logger.warning(f"EDSM data is not a list: {type(data)}")
                 return None
             
-            systems = []
+            names = []
+            ids = []
+            coords = []
             for sys in data:
                 if not isinstance(sys, dict) or 'coords' not in sys:
                     continue
                 
                 try:
-                    sx = float(sys['coords']['x'])
-                    sy = float(sys['coords']['y'])
-                    sz = float(sys['coords']['z'])
-                    
-                    dx = sx - x
-                    dy = sy - y
-                    dz = sz - z
-                    dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-                    
-                    systems.append(SystemNode(
-                        name=sys['name'],
-                        id64=sys.get('id64'),
-                        x=sx,
-                        y=sy,
-                        z=sz,
-                        distance=dist
-                    ))
+                    c = sys['coords']
+                    sx, sy, sz = float(c['x']), float(c['y']), float(c['z'])
+                    name = sys['name']
                 except (KeyError, ValueError, TypeError) as e:
-                    logger.debug(f"Skipping invalid system: {e}")
+                    logger.debug("Skipping invalid system: %s", e)
                     continue
+                
+                names.append(name)
+                ids.append(sys.get('id64'))
+                coords.append((sx, sy, sz))
             
-            systems.sort(key=lambda s: s.distance)
+            table = SystemTable.from_columns(names, ids, coords).within_radius(x, y, z, radius)
+            systems = list(table.iter_nodes())
             logger.info(f"EDSM sphere returned {len(systems)} systems")
             return systems if systems else None
             
@@ -270,105 +892,146 @@ class EDSMSource(SystemDataSource):
             logger.error(f"EDSM sphere query failed: {e}")
             return None
     
-    def _query_cube_tiled(self, x: float, y: float, z: float, radius: float) -> Optional[List[SystemNode]]:
-        """Query EDSM using cube tiling to cover the sphere."""
+    @staticmethod
+    def _tile_systems(data: Any) -> Optional[List[Dict[str, Any]]]:
+        """Unwrap a cube-systems response into its list of systems."""
+        # Handle dict response
+        if isinstance(data, dict):
+            data = data.get('systems')
+        return data if isinstance(data, list) else None
+    
+    def _fetch_tile(self, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one EDSM cube tile (the session adapter handles retries)."""
+        url = f"{EDSM_BASE}{EDSM_CUBE}"
+        try:
+            response = self._session.get(url, params=params, timeout=15)
+            if response.status_code != 200:
+                logger.debug("Tile %s returned %s", params, response.status_code)
+                return None
+            return self._tile_systems(_json_loads(response.content))
+        except Exception as e:
+            logger.debug("Cube tile %s failed: %s", params, e)
+        return None
+    
+    def _fetch_tiles_threaded(self, tile_params: List[Dict[str, Any]]) -> List[Optional[List[Dict[str, Any]]]]:
+        """Fetch all tiles over HTTP/1.1 using a thread pool."""
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(tile_params)
+        with ThreadPoolExecutor(max_workers=EDSM_TILE_WORKERS) as executor:
+            futures = {executor.submit(self._fetch_tile, p): i for i, p in enumerate(tile_params)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+    
+    def _fetch_tiles_http2(self, tile_params: List[Dict[str, Any]]) -> List[Optional[List[Dict[str, Any]]]]:
+        """Fetch all tiles multiplexed over a single HTTP/2 connection."""
+        url = f"{EDSM_BASE}{EDSM_CUBE}"
+        
+        async def fetch_all():
+            limit = asyncio.Semaphore(EDSM_TILE_WORKERS)
+            async with httpx.AsyncClient(http2=True, timeout=15, headers=dict(self._session.headers)) as client:
+                async def fetch(params):
+                    async with limit:
+                        for attempt in range(EDSM_TILE_ATTEMPTS):
+                            if attempt:
+                                await asyncio.sleep(delay)
+                            delay = EDSM_RETRY_BACKOFF * 2 ** attempt
+                            try:
+                                response = await client.get(url, params=params)
+                            except Exception as e:
+                                logger.debug("Cube tile %s failed (attempt %d): %s", params, attempt + 1, e)
+                                continue
+                            if response.status_code == 200:
+                                try:
+                                    return self._tile_systems(_json_loads(response.content))
+                                except ValueError as e:
+                                    logger.debug("Cube tile %s returned invalid JSON: %s", params, e)
+                                    return None
+                            logger.debug("Tile %s returned %s (attempt %d)", params, response.status_code, attempt + 1)
+                            if response.status_code not in EDSM_RETRY_STATUSES:
+                                return None
+                            # Rate limited: wait as long as EDSM asks
+                            retry_after = response.headers.get('Retry-After', '')
+                            if retry_after.isdigit():
+                                delay = min(float(retry_after), EDSM_MAX_RETRY_AFTER)
+                        return None
+                
+                return await asyncio.gather(*(fetch(p) for p in tile_params))
+        
+        return asyncio.run(fetch_all())
+    
+    def _query_cube_tiled(self, x: float, y: float, z: float, radius: float) -> Tuple[Optional[List[SystemNode]], bool]:
+        """Query EDSM using cube tiling to cover the sphere.
+        
+        Returns the systems found and whether every tile answered.
+        """
         try:
-            # Use larger cube size and more tiles for better coverage
-            cube_size = 200  # EDSM max is 200
-            tiles_needed = max(1, int(math.ceil(radius / 80)))  # More overlap
+            cube_size = EDSM_CUBE_SIZE
+            tiles = _tile_offsets(radius)
             
-            all_systems = []
-            seen_ids = set()
-            seen_names = set()
+            names = []
+            ids = []
+            coords = []
             
-            logger.info(f"EDSM Cube Tiling: {tiles_needed}x{tiles_needed}x{tiles_needed} tiles, cube size {cube_size}")
+            tile_params = [
+                {
+                    'x': x + dx,
+                    'y': y + dy,
+                    'z': z + dz,
+                    'size': cube_size,
+                    'showCoordinates': 1,
+                    'showId': 1
+                } for dx, dy, dz in tiles
+            ]
+            
+            logger.info(f"EDSM Cube Tiling: {len(tiles)} tiles, cube size {cube_size}")
+            
+            responses = None
+            if httpx is not None:
+                try:
+                    responses = self._fetch_tiles_http2(tile_params)
+                except Exception as e:
+                    logger.warning(f"HTTP/2 tile fetch failed, falling back to threads: {e}")
+            if responses is None:
+                responses = self._fetch_tiles_threaded(tile_params)
             
             tile_count = 0
-            for tx in range(-tiles_needed, tiles_needed + 1):
-                for ty in range(-tiles_needed, tiles_needed + 1):
-                    for tz in range(-tiles_needed, tiles_needed + 1):
-                        cx = x + tx * 80  # 80ly spacing for overlap
-                        cy = y + ty * 80
-                        cz = z + tz * 80
-                        
-                        url = f"{EDSM_BASE}{EDSM_CUBE}"
-                        params = {'x': cx, 'y': cy, 'z': cz, 'size': cube_size, 'showCoordinates': 1}
-                        
-                        try:
-                            response = self._session.get(url, params=params, timeout=15)
-                            if response.status_code != 200:
-                                logger.debug(f"Tile ({tx},{ty},{tz}) returned {response.status_code}")
-                                continue
-                            
-                            data = response.json()
-                            
-                            # Handle dict response
-                            if isinstance(data, dict):
-                                if 'systems' in data:
-                                    data = data['systems']
-                                else:
-                                    continue
-                            
-                            if not isinstance(data, list):
-                                continue
-                            
-                            tile_systems = 0
-                            for sys in data:
-                                if not isinstance(sys, dict) or 'coords' not in sys:
-                                    continue
-                                
-                                sys_id = sys.get('id64')
-                                sys_name = sys.get('name', '')
-                                
-                                # Deduplicate by ID or name
-                                if sys_id and sys_id in seen_ids:
-                                    continue
-                                if sys_name in seen_names:
-                                    continue
-                                
-                                if sys_id:
-                                    seen_ids.add(sys_id)
-                                if sys_name:
-                                    seen_names.add(sys_name)
-                                
-                                try:
-                                    sx = float(sys['coords']['x'])
-                                    sy = float(sys['coords']['y'])
-                                    sz = float(sys['coords']['z'])
-                                    
-                                    dx = sx - x
-                                    dy = sy - y
-                                    dz = sz - z
-                                    dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-                                    
-                                    if dist <= radius:
-                                        all_systems.append(SystemNode(
-                                            name=sys_name,
-                                            id64=sys_id,
-                                            x=sx,
-                                            y=sy,
-                                            z=sz,
-                                            distance=dist
-                                        ))
-                                        tile_systems += 1
-                                except (KeyError, ValueError, TypeError):
-                                    continue
-                            
-                            tile_count += 1
-                            if tile_systems > 0:
-                                logger.debug(f"Tile ({tx},{ty},{tz}) added {tile_systems} systems")
-                                    
-                        except Exception as e:
-                            logger.debug(f"Cube tile ({tx},{ty},{tz}) failed: {e}")
-                            continue
+            for tile, data in zip(tiles, responses):
+                if data is None:
+                    continue
+                
+                tile_systems = 0
+                for sys in data:
+                    if not isinstance(sys, dict) or 'coords' not in sys:
+                        continue
+                    
+                    try:
+                        c = sys['coords']
+                        sx, sy, sz = float(c['x']), float(c['y']), float(c['z'])
+                    except (KeyError, ValueError, TypeError):
+                        continue
+                    
+                    names.append(sys.get('name', ''))
+                    ids.append(sys.get('id64'))
+                    coords.append((sx, sy, sz))
+                    tile_systems += 1
+                
+                tile_count += 1
+                if tile_systems > 0:
+                    logger.debug("Tile %s added %d systems", tile, tile_systems)
             
-            all_systems.sort(key=lambda s: s.distance)
+            # Overlapping tiles return the same systems; filter and deduplicate
+            # once over all tiles
+            table = SystemTable.from_columns(names, ids, coords).within_radius(x, y, z, radius)
+            table = table.deduplicated()
+            all_systems = list(table.iter_nodes())
             logger.info(f"EDSM cube tiling: queried {tile_count} tiles, returned {len(all_systems)} systems")
-            return all_systems if all_systems else None
+            if tile_count < len(tiles):
+                logger.warning(f"EDSM cube tiling: {len(tiles) - tile_count} tiles failed; result is incomplete")
+            return (all_systems if all_systems else None), tile_count == len(tiles)
             
         except Exception as e:
             logger.error(f"EDSM cube tiling failed: {e}")
-            return None
+            return None, False
     
     def get_name(self) -> str:
         return "EDSM"
@@ -382,6 +1045,16 @@ class EDDiscoverySource(SystemDataSource):
     
     def __init__(self):
         self.db_path = None
+        # One read-only connection, reused for every query
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._table_name: Optional[str] = None
+        # R*Tree sidecar: highest system id it covers once attached as idx;
+        # built at most once per session, on a background thread
+        self._rtree_max_id: Optional[int] = None
+        self._rtree_build: Optional[threading.Thread] = None
+        self._rtree_failed = False
+        self._available: Optional[bool] = None  # cached is_available() result
         self._check_paths()
     
     def _check_paths(self):
@@ -397,18 +1070,60 @@ class EDDiscoverySource(SystemDataSource):
                 logger.info(f"Found EDDiscovery DB at: {path}")
                 break
     
+    def _connection(self) -> sqlite3.Connection:
+        """Open the shared connection on first use. Caller must hold self._lock."""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                Path(self.db_path).as_uri() + "?mode=ro",
+                uri=True,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn = conn
+        return self._conn
+    
+    def close(self):
+        """Close the shared connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._rtree_max_id = None
+            self._available = None
+    
+    def _find_table(self, conn: sqlite3.Connection) -> Optional[str]:
+        """Detect (once) which table holds the systems."""
+        if self._table_name:
+            return self._table_name
+        for name in ['SystemList', 'Systems', 'EdsmSystems', 'system']:
+            try:
+                conn.execute(f"SELECT * FROM {name} LIMIT 1")
+                self._table_name = name
+                logger.info(f"Using EDDiscovery table: {name}")
+                break
+            except sqlite3.Error:
+                continue
+        return self._table_name
+    
     def is_available(self) -> bool:
+        # The schema probe only needs to run once per connection
+        if self._available is None:
+            self._available = self._check_available()
+        return self._available
+    
+    def _check_available(self) -> bool:
         if not self.db_path:
             return False
         
         # Test if we can actually query the database
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            # Try to find the correct table name
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in cursor.fetchall()]
-            conn.close()
+            with self._lock:
+                # Try to find the correct table name
+                rows = self._connection().execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+            tables = [row[0] for row in rows]
             
             logger.info(f"EDDiscovery DB tables: {tables}")
             
@@ -426,67 +1141,134 @@ class EDDiscoverySource(SystemDataSource):
             return None
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Try different table names
-            table_name = None
-            for name in ['SystemList', 'Systems', 'EdsmSystems', 'system']:
-                try:
-                    cursor.execute(f"SELECT * FROM {name} LIMIT 1")
-                    table_name = name
-                    logger.info(f"Using EDDiscovery table: {name}")
-                    break
-                except:
-                    continue
-            
-            if not table_name:
-                conn.close()
-                logger.error("No suitable table found in EDDiscovery DB")
+            with self._lock:
+                rows = self._query_bbox(x, y, z, radius)
+            if rows is None:
                 return None
             
+            table = SystemTable.from_rows(rows).within_radius(x, y, z, radius)
+            systems = list(table.iter_nodes())
+            logger.info(f"EDDiscovery DB returned {len(systems)} systems")
+            return systems if systems else None
+        except Exception as e:
+            logger.error(f"EDDiscovery query failed: {e}")
+            return None
+    
+    def _query_bbox(self, x: float, y: float, z: float, radius: float) -> Optional[List[Tuple]]:
+        """Fetch the rows inside the bounding box of the sphere. Caller must hold self._lock."""
+        conn = self._connection()
+        table_name = self._find_table(conn)
+        if not table_name:
+            logger.error("No suitable table found in EDDiscovery DB")
+            return None
+        
+        max_id = self._rtree_max_id_for(conn, table_name)
+        if max_id is not None:
+            # R*Tree prunes to the bounding box without scanning the table;
+            # systems EDDiscovery added after the index was built are read
+            # directly by id
+            query = f"""
+            SELECT s.name, s.x, s.y, s.z, s.id
+            FROM idx.systems_rtree r
+            JOIN {table_name} s ON s.id = r.id
+            WHERE
+                r.maxX >= :x0 AND r.minX <= :x1 AND
+                r.maxY >= :y0 AND r.minY <= :y1 AND
+                r.maxZ >= :z0 AND r.minZ <= :z1 AND
+                (s.x - :x) * (s.x - :x) + (s.y - :y) * (s.y - :y) + (s.z - :z) * (s.z - :z) <= :r2
+            UNION ALL
+            SELECT name, x, y, z, id
+            FROM {table_name}
+            WHERE
+                id > :max_id AND
+                x BETWEEN :x0 AND :x1 AND
+                y BETWEEN :y0 AND :y1 AND
+                z BETWEEN :z0 AND :z1 AND
+                (x - :x) * (x - :x) + (y - :y) * (y - :y) + (z - :z) * (z - :z) <= :r2
+            LIMIT 1000
+            """
+        else:
             # Query with bounding box
             query = f"""
             SELECT name, x, y, z, id
             FROM {table_name}
             WHERE 
-                x BETWEEN ? AND ? AND
-                y BETWEEN ? AND ? AND
-                z BETWEEN ? AND ?
+                x BETWEEN :x0 AND :x1 AND
+                y BETWEEN :y0 AND :y1 AND
+                z BETWEEN :z0 AND :z1 AND
+                (x - :x) * (x - :x) + (y - :y) * (y - :y) + (z - :z) * (z - :z) <= :r2
             LIMIT 1000
             """
-            
-            cursor.execute(query, (
-                x - radius, x + radius,
-                y - radius, y + radius,
-                z - radius, z + radius
-            ))
-            
-            systems = []
-            for row in cursor.fetchall():
-                name, sx, sy, sz, sys_id = row
-                dx = sx - x
-                dy = sy - y
-                dz = sz - z
-                dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-                
-                if dist <= radius:
-                    systems.append(SystemNode(
-                        name=name,
-                        id64=sys_id,
-                        x=sx,
-                        y=sy,
-                        z=sz,
-                        distance=dist
-                    ))
-            
-            conn.close()
-            systems.sort(key=lambda s: s.distance)
-            logger.info(f"EDDiscovery DB returned {len(systems)} systems")
-            return systems if systems else None
-        except Exception as e:
-            logger.error(f"EDDiscovery query failed: {e}")
+        
+        # Squared-distance test in SQL so the row limit only counts systems
+        # inside the sphere, not the corners of the box
+        return conn.execute(query, {
+            'x': x, 'y': y, 'z': z, 'r2': radius * radius, 'max_id': max_id,
+            'x0': x - radius, 'x1': x + radius,
+            'y0': y - radius, 'y1': y + radius,
+            'z0': z - radius, 'z1': z + radius
+        }).fetchall()
+    
+    def _rtree_max_id_for(self, conn: sqlite3.Connection, table_name: str) -> Optional[int]:
+        """Attach the R*Tree sidecar if it is ready; returns the highest id it covers.
+        
+        Returns None while the index is missing, being built, or cannot be
+        built (e.g. SQLite without the rtree module); callers then use the
+        plain bounding-box query. Caller must hold self._lock.
+        """
+        if self._rtree_max_id is not None:
+            return self._rtree_max_id
+        if self._rtree_build is not None or self._rtree_failed:
             return None
+        
+        if os.path.exists(EDD_RTREE_FILE):
+            try:
+                conn.execute("ATTACH DATABASE ? AS idx", (Path(EDD_RTREE_FILE).as_uri() + "?mode=ro",))
+                try:
+                    row = conn.execute("SELECT source_table, max_id FROM idx.rtree_meta").fetchone()
+                except sqlite3.Error:
+                    row = None  # left by an older version or an interrupted build
+                if row and row[0] == table_name:
+                    self._rtree_max_id = row[1] or 0
+                    return self._rtree_max_id
+                conn.execute("DETACH DATABASE idx")
+            except sqlite3.Error as e:
+                logger.warning(f"Ignoring unreadable EDDiscovery R*Tree index: {e}")
+        
+        self._rtree_build = threading.Thread(
+            target=self._build_rtree, args=(table_name,), name=f"{plugin_name}-edd-rtree", daemon=True
+        )
+        self._rtree_build.start()
+        return None
+    
+    def _build_rtree(self, table_name: str):
+        """Build the R*Tree sidecar in a temporary file, then move it into place."""
+        tmp_path = EDD_RTREE_FILE + '.tmp'
+        logger.info(f"Building EDDiscovery R*Tree index for {table_name}")
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.execute("ATTACH DATABASE ? AS edd", (Path(self.db_path).as_uri() + "?mode=ro",))
+                max_id = conn.execute(f"SELECT max(id) FROM edd.{table_name}").fetchone()[0] or 0
+                conn.execute("CREATE VIRTUAL TABLE systems_rtree USING rtree(id, minX, maxX, minY, maxY, minZ, maxZ)")
+                conn.execute(
+                    f"INSERT INTO systems_rtree SELECT id, x, x, y, y, z, z FROM edd.{table_name} WHERE id <= ?",
+                    (max_id,)
+                )
+                conn.execute("CREATE TABLE rtree_meta (source_table TEXT, max_id INTEGER)")
+                conn.execute("INSERT INTO rtree_meta VALUES (?, ?)", (table_name, max_id))
+                conn.commit()
+            finally:
+                conn.close()
+            os.replace(tmp_path, EDD_RTREE_FILE)
+            logger.info("EDDiscovery R*Tree index ready")
+        except Exception as e:
+            self._rtree_failed = True
+            logger.warning(f"EDDiscovery R*Tree index unavailable, using table scan: {e}")
+        finally:
+            self._rtree_build = None
     
     def get_name(self) -> str:
         return "EDDiscovery"
@@ -500,58 +1282,183 @@ class LocalJSONSource(SystemDataSource):
     
     def __init__(self, file_path: Optional[str] = None):
         self.file_path = file_path
-        self._data = None
+        self._table: Optional[SystemTable] = None
+        self._lock = threading.Lock()
+        self._requested: Optional[str] = None  # path waiting for the loader
+        self._loader: Optional[threading.Thread] = None
         if file_path:
             self._load_file()
     
     def set_file(self, path: str):
-        self.file_path = path
-        self._load_file()
+        """Switch to another file; it is parsed on a background thread.
+        
+        Paths set while a load is running replace each other, and the loader
+        picks up the latest one when it finishes.
+        """
+        with self._lock:
+            self._requested = path
+            self._table = None
+            if self._loader is None:
+                self._loader = threading.Thread(
+                    target=self._load_requested, name=f"{plugin_name}-local-json", daemon=True
+                )
+                self._loader.start()
+    
+    def _load_requested(self):
+        while True:
+            with self._lock:
+                path = self._requested
+                if path is None:
+                    self._loader = None
+                    return
+                self._requested = None
+                # Only the loader changes file_path, so a load never mixes files
+                self.file_path = path
+            self._load_file()
+            with self._lock:
+                if self._requested is not None:
+                    self._table = None  # already out of date
     
     def _load_file(self):
-        if not self.file_path or not os.path.exists(self.file_path):
-            self._data = None
+        self._table = None
+        if not self.file_path:
+            return
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return
+        # Taken before parsing, so a file replaced meanwhile is not cached as current
+        source = (st.st_size, st.st_mtime_ns)
+        
+        if self._load_sidecar(source):
             return
         
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                self._data = json.load(f)
-            logger.info(f"Loaded local JSON: {self.file_path}")
+            names = []
+            ids = []
+            coords = []  # flat x, y, z, x, y, z, ...; no tuple per row
+            add_coords = coords.extend
+            for sys in self._iter_json_systems():
+                try:
+                    name = sys['Name']
+                    c = (sys['X'], sys['Y'], sys['Z'])
+                except (KeyError, TypeError):
+                    continue
+                names.append(name)
+                ids.append(sys.get('id64'))
+                add_coords(c)
+            
+            self._table = self._build_table(names, ids, coords)
+            logger.info(f"Loaded local JSON: {self.file_path} ({len(self._table)} systems)")
         except Exception as e:
             logger.error(f"Failed to load JSON: {e}")
-            self._data = None
+            return
+        
+        self._write_sidecar(source)
+    
+    @staticmethod
+    def _build_table(names: List[str], ids: List[Optional[int]], coords: List[Any]) -> SystemTable:
+        """Convert the flat raw coordinates in one bulk call, dropping rows that are not numeric."""
+        if np is not None:
+            try:
+                xyz = np.fromiter(coords, dtype=np.float32, count=len(coords)).reshape(-1, 3)
+            except (ValueError, TypeError):
+                xyz = None  # some row holds a non-numeric value; check row by row below
+            if xyz is not None:
+                ok = np.isfinite(xyz).all(axis=1)  # None converts to NaN
+                if ok.all():
+                    return SystemTable(names, ids, xyz)
+                keep = np.nonzero(ok)[0].tolist()
+                return SystemTable([names[i] for i in keep], [ids[i] for i in keep], xyz[keep])
+        
+        good_names, good_ids, good_coords = [], [], []
+        it = iter(coords)
+        for name, sys_id, sx, sy, sz in zip(names, ids, it, it, it):
+            try:
+                c = (float(sx), float(sy), float(sz))
+            except (ValueError, TypeError):
+                continue
+            good_names.append(name)
+            good_ids.append(sys_id)
+            good_coords.append(c)
+        return SystemTable.from_columns(good_names, good_ids, good_coords)
+    
+    def _iter_json_systems(self):
+        """Yield the entries of the 'Nearest' array.
+        
+        With ijson the array is streamed, so the full document tree is never
+        held in memory at once.
+        """
+        with open(self.file_path, 'rb') as f:
+            if ijson is not None:
+                yield from ijson.items(f, 'Nearest.item', use_float=True)
+            else:
+                yield from _json_loads(f.read()).get('Nearest', [])
+    
+    def _sidecar_path(self) -> str:
+        return self.file_path + '.npz'
+    
+    def _load_sidecar(self, source: Tuple[int, int]) -> bool:
+        """Load parsed columns from the .npz sidecar if it was built from this JSON.
+        
+        source is the JSON's (size, mtime_ns); copies that preserve timestamps
+        can make an old sidecar look newer, so both are compared.
+        """
+        if np is None:
+            return False
+        
+        sidecar = self._sidecar_path()
+        try:
+            with np.load(sidecar) as z:
+                if 'source' not in z.files or tuple(z['source'].tolist()) != source:
+                    return False
+                self._table = SystemTable(
+                    names=z['names'].tolist(),
+                    ids=[i or None for i in z['ids'].tolist()],
+                    xyz=z['xyz']
+                )
+            logger.info(f"Loaded local JSON cache: {sidecar} ({len(self._table)} systems)")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable JSON cache {sidecar}: {e}")
+            self._table = None
+            return False
+    
+    def _write_sidecar(self, source: Tuple[int, int]):
+        """Store parsed columns next to the JSON so the next start skips parsing."""
+        if np is None:
+            return
+        
+        sidecar = self._sidecar_path()
+        try:
+            np.savez(
+                sidecar,
+                xyz=self._table.xyz,
+                names=np.array(self._table.names, dtype=str),
+                ids=np.array([i or 0 for i in self._table.ids], dtype=np.int64),
+                source=np.array(source, dtype=np.int64)
+            )
+            logger.debug("Wrote local JSON cache: %s", sidecar)
+        except Exception as e:
+            logger.warning(f"Could not write JSON cache {sidecar}: {e}")
     
     def is_available(self) -> bool:
-        return self._data is not None
+        # A file still being parsed counts; get_systems_near() waits for it
+        return self._table is not None or self._loader is not None
     
     def get_systems_near(self, x: float, y: float, z: float, radius: float, system_name: Optional[str] = None) -> Optional[List[SystemNode]]:
-        if not self.is_available():
+        loader = self._loader
+        if loader is not None:
+            logger.info("Waiting for local JSON to finish loading")
+            loader.join()
+        table = self._table  # set_file() may clear it meanwhile
+        if table is None:
             return None
         
         try:
-            raw_systems = self._data.get('Nearest', [])
-            systems = []
-            
-            for sys in raw_systems:
-                if not all(k in sys for k in ['Name', 'X', 'Y', 'Z']):
-                    continue
-                
-                dx = sys['X'] - x
-                dy = sys['Y'] - y
-                dz = sys['Z'] - z
-                dist = math.sqrt(dx*dx + dy*dy + dz*dz)
-                
-                if dist <= radius:
-                    systems.append(SystemNode(
-                        name=sys['Name'],
-                        id64=None,  # Will be filled from journal
-                        x=sys['X'],
-                        y=sys['Y'],
-                        z=sys['Z'],
-                        distance=dist
-                    ))
-            
-            systems.sort(key=lambda s: s.distance)
+            systems = list(table.within_radius(x, y, z, radius).iter_nodes())
             logger.info(f"Local JSON returned {len(systems)} systems")
             return systems if systems else None
         except Exception as e:
@@ -578,6 +1485,10 @@ class DataSourceManager:
     def set_local_file(self, path: str):
         self.sources['local_json'].set_file(path)
     
+    def close(self):
+        for source in self.sources.values():
+            source.close()
+    
     def get_best_source(self, prefer_source: Optional[str] = None) -> Optional[SystemDataSource]:
         """Get best available source."""
         # If preference specified and available, use it
@@ -654,6 +1565,29 @@ _current_system: Optional[str] = None
 _current_system_id: Optional[int] = None
 _current_coords: Optional[Tuple[float, float, float]] = None
 _current_max_jump: Optional[float] = None
+_target_cache: Tuple[Any, ...] = ()  # (inputs, result) of the last _get_next_target()
+# PendingSystems reuses scratch buffers between picks; the survey thread and
+# the Tk thread both ask for targets
+_target_lock = threading.Lock()
+_last_monitor: Tuple[Any, ...] = ()  # (name, id64, StarPos) last read from the monitor
+_query_thread: Optional[threading.Thread] = None  # survey system query in progress
+
+# Preference read on every jump; refreshed in plugin_start3/prefs_changed
+_autocopy_enabled = True
+
+# Debounced state saving
+SAVE_DELAY_MS = 2000
+_save_pending = False
+_save_timer: Optional[str] = None
+
+# Delayed clipboard copy after jumps; rapid jumps keep only the latest target
+CLIPBOARD_DELAY_MS = 1500
+_clipboard_timer: Optional[str] = None
+
+# Background state writer; holds at most one job: the latest unsaved
+# snapshot ('state', (meta, rows)) or visits to log ('progress', visits)
+_writer_queue: queue.Queue = queue.Queue(maxsize=1)
+_writer_thread: Optional[threading.Thread] = None
 
 # UI Widgets
 _root_frame: Optional[tk.Frame] = None
@@ -662,20 +1596,33 @@ _target_var: Optional[tk.StringVar] = None
 _progress_var: Optional[tk.StringVar] = None
 _source_status_var: Optional[tk.StringVar] = None
 
+# Coalesced UI refresh
+UI_UPDATE_DELAY_MS = 50
+_ui_update_pending = False
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+def _legacy_getter(convert):
+    """Typed getter for EDMC versions whose config only has get()."""
+    def get(key: str):
+        val = config.get(key)
+        return None if val is None else convert(val)
+    return get
+
+
+# The config API does not change while EDMC runs; pick the accessors once
+_cfg_get_bool = config.get_bool if hasattr(config, 'get_bool') else _legacy_getter(bool)
+_cfg_get_int = config.get_int if hasattr(config, 'get_int') else _legacy_getter(int)
+_cfg_get_str = config.get_str if hasattr(config, 'get_str') else _legacy_getter(str)
+
+
 def _get_config_bool(key: str, default: bool = False) -> bool:
     """Get boolean config value with fallback for older EDMC versions."""
     try:
-        if hasattr(config, 'get_bool'):
-            return config.get_bool(key)
-        else:
-            val = config.get(key)
-            if val is None:
-                return default
-            return bool(val)
+        val = _cfg_get_bool(key)
+        return default if val is None else val
     except:
         return default
 
@@ -683,13 +1630,8 @@ def _get_config_bool(key: str, default: bool = False) -> bool:
 def _get_config_int(key: str, default: int = 0) -> int:
     """Get integer config value with fallback."""
     try:
-        if hasattr(config, 'get_int'):
-            return config.get_int(key)
-        else:
-            val = config.get(key)
-            if val is None:
-                return default
-            return int(val)
+        val = _cfg_get_int(key)
+        return default if val is None else val
     except:
         return default
 
@@ -697,71 +1639,281 @@ def _get_config_int(key: str, default: int = 0) -> int:
 def _get_config_str(key: str, default: str = '') -> str:
     """Get string config value with fallback."""
     try:
-        if hasattr(config, 'get_str'):
-            return config.get_str(key)
-        else:
-            val = config.get(key)
-            return str(val) if val is not None else default
+        val = _cfg_get_str(key)
+        return default if val is None else val
     except:
         return default
 
+
+def _refresh_cached_flags():
+    """Re-read the preferences consulted on hot paths."""
+    global _autocopy_enabled
+    _autocopy_enabled = _get_config_bool(CFG_AUTOCOPY, True)
+    # "Debug logging" forces this plugin's debug lines on; otherwise the
+    # level EDMC's logging setup gives the logger applies
+    logger.setLevel(logging.DEBUG if _get_config_bool(CFG_DEBUG, False) else _default_log_level)
+
 # ============================================================================
 # State Persistence
 # ============================================================================
 
-def _save_state():
-    """Save state to disk."""
+# survey_systems.bin: magic, record count, then per system
+# id64 (0 = unknown), x, y, z, distance, pending flag, name length, UTF-8 name.
+# float32 is exact for ED coordinates (1/32 ly steps within +-65k ly).
+_SYSTEMS_MAGIC = b'ESS1'
+_SYSTEMS_HEADER = struct.Struct('<4sI')
+_SYSTEM_RECORD = struct.Struct('<qfffd?H')
+
+
+def _encode_systems(rows: List[Tuple[str, Optional[int], float, float, float, float, bool]]) -> bytes:
+    pack = _SYSTEM_RECORD.pack
+    parts = [_SYSTEMS_HEADER.pack(_SYSTEMS_MAGIC, len(rows))]
+    for name, sys_id, x, y, z, distance, pending in rows:
+        raw = name.encode('utf-8')
+        parts.append(pack(sys_id or 0, x, y, z, distance, pending, len(raw)))
+        parts.append(raw)
+    return b''.join(parts)
+
+
+def _decode_systems(buf: bytes) -> Iterator[Tuple[SystemNode, bool]]:
+    magic, count = _SYSTEMS_HEADER.unpack_from(buf, 0)
+    if magic != _SYSTEMS_MAGIC:
+        raise ValueError("unknown system list format")
+    unpack = _SYSTEM_RECORD.unpack_from
+    offset = _SYSTEMS_HEADER.size
+    for _ in range(count):
+        sys_id, x, y, z, distance, pending, name_len = unpack(buf, offset)
+        offset += _SYSTEM_RECORD.size
+        name = intern(buf[offset:offset + name_len].decode('utf-8'))
+        offset += name_len
+        yield SystemNode(name=name, id64=sys_id or None, x=x, y=y, z=z, distance=distance), pending
+
+
+def _node_from_row(row) -> SystemNode:
+    """Build a node from a JSON state file written before survey_systems.bin."""
+    if isinstance(row, dict):
+        row = dict(row, name=_intern_name(row['name']))
+        return SystemNode(**row)
+    return SystemNode(_intern_name(row[0]), *row[1:])
+
+
+def _atomic_write(path: str, payload: bytes):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _state_snapshot() -> Tuple[Dict[str, Any], Optional[list]]:
+    """Copy the survey state into plain containers: (JSON metadata, system rows).
+    
+    Rows are None when the system list hasn't changed since it was last saved.
+    """
+    rows = None
+    if _state.systems_dirty:
+        pending = {s.name for s in _state.pending_systems}
+        rows = [
+            (s.name, s.id64, s.x, s.y, s.z, s.distance, s.name in pending)
+            for s in _state.all_systems.values()
+        ]
+    meta = {
+        'active': _state.active,
+        'start_system': _state.start_system,
+        'start_coords': list(_state.start_coords) if _state.start_coords else None,
+        'radius_ly': _state.radius_ly,
+        'max_jump_ly': _state.max_jump_ly,
+        'prefer_short_jumps': _state.prefer_short_jumps,
+        'visited_ids': list(_state.visited_ids),
+        'visited_names': list(_state.visited_names),
+        'started_ts': _state.started_ts,
+        'data_source_used': _state.data_source_used
+    }
+    return meta, rows
+
+
+def _write_state(data: Tuple[Dict[str, Any], list]):
+    """Encode a snapshot and replace the state files atomically.
+    
+    The snapshot includes every visit so far, so the progress log starts over.
+    """
+    meta, rows = data
     try:
-        data = {
-            'active': _state.active,
-            'start_system': _state.start_system,
-            'start_coords': list(_state.start_coords) if _state.start_coords else None,
-            'radius_ly': _state.radius_ly,
-            'max_jump_ly': _state.max_jump_ly,
-            'prefer_short_jumps': _state.prefer_short_jumps,
-            'pending_systems': [
-                {
-                    'name': s.name,
-                    'id64': s.id64,
-                    'x': s.x,
-                    'y': s.y,
-                    'z': s.z,
-                    'distance': s.distance
-                } for s in _state.pending_systems
-            ],
-            'visited_ids': list(_state.visited_ids),
-            'visited_names': list(_state.visited_names),
-            'all_systems': {
-                name: {
-                    'name': s.name,
-                    'id64': s.id64,
-                    'x': s.x,
-                    'y': s.y,
-                    'z': s.z,
-                    'distance': s.distance
-                } for name, s in _state.all_systems.items()
-            },
-            'started_ts': _state.started_ts,
-            'data_source_used': _state.data_source_used
-        }
-        
-        with open(STATE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        
+        if rows is not None:
+            _atomic_write(SYSTEMS_FILE, _encode_systems(rows))
+        _atomic_write(STATE_FILE, _json_dumps(meta))
+        open(PROGRESS_FILE, 'wb').close()
         logger.debug("State saved")
     except Exception as e:
+        # try again with the next save
+        _state.dirty = True
+        if rows is not None:
+            _state.systems_dirty = True
         logger.error(f"Failed to save state: {e}")
 
 
+def _append_progress(visits: List[Tuple[Optional[int], str]]):
+    """Append visits to the progress log, one JSON object per line."""
+    try:
+        with open(PROGRESS_FILE, 'ab') as f:
+            f.write(b''.join(
+                _json_dumps({'id': system_id, 'name': name}) + b'\n'
+                for system_id, name in visits
+            ))
+        logger.debug("Logged %d visits", len(visits))
+    except Exception as e:
+        _state.dirty = True  # a full save covers the lost visits
+        logger.error(f"Failed to save progress: {e}")
+
+
+def _run_write(job: Tuple[str, Any]):
+    kind, data = job
+    if kind == 'state':
+        _write_state(data)
+    else:
+        _append_progress(data)
+
+
+def _writer_loop():
+    while True:
+        job = _writer_queue.get()
+        if job is None:
+            break
+        _run_write(job)
+
+
+def _start_writer():
+    """Start the background state writer thread."""
+    global _writer_thread
+    if _writer_thread is None or not _writer_thread.is_alive():
+        _writer_thread = threading.Thread(target=_writer_loop, name=f"{plugin_name}-writer", daemon=True)
+        _writer_thread.start()
+
+
+def _stop_writer():
+    """Let the writer finish the queued snapshot, then stop it."""
+    global _writer_thread
+    if _writer_thread is None:
+        return
+    _writer_queue.put(None)
+    _writer_thread.join(timeout=5)
+    _writer_thread = None
+
+
+def _snapshot_job() -> Optional[Tuple[str, Any]]:
+    try:
+        data = _state_snapshot()
+    except Exception as e:
+        logger.error(f"Failed to save state: {e}")
+        return None
+    _state.dirty = False
+    _state.systems_dirty = False
+    _state.visits = []
+    return ('state', data)
+
+
+def _save_state():
+    """Save state to disk.
+    
+    Visits alone are appended to the progress log; anything else rewrites
+    the state files. The snapshot is taken on the calling thread; encoding
+    and file I/O happen on the writer thread when it is running.
+    """
+    if _state.dirty:
+        job = _snapshot_job()
+    elif _state.visits:
+        job = ('progress', _state.visits)
+        _state.visits = []
+    else:
+        return
+    if job is None:
+        return
+    
+    if _writer_thread is None:
+        _run_write(job)
+        return
+    
+    while True:
+        try:
+            _writer_queue.put_nowait(job)
+            break
+        except queue.Full:
+            try:
+                waiting = _writer_queue.get_nowait()
+            except queue.Empty:
+                continue
+            if job[0] == 'progress':
+                if waiting[0] == 'progress':
+                    job = ('progress', waiting[1] + job[1])
+                    continue
+                # The waiting snapshot predates these visits; take a new one
+                job = _snapshot_job()
+                if job is None:
+                    return
+            # The newer snapshot replaces the waiting job, but keeps its
+            # system rows if it has none of its own
+            if waiting[0] == 'state' and job[1][1] is None:
+                job = ('state', (job[1][0], waiting[1][1]))
+
+
+def _schedule_save():
+    """Save state soon; jumps in quick succession share one write."""
+    global _save_pending, _save_timer
+    _save_pending = True
+    if not _root_frame:
+        _flush_save()
+        return
+    if _save_timer is None:
+        _save_timer = _root_frame.after(SAVE_DELAY_MS, _flush_save)
+
+
+def _flush_save():
+    """Write a scheduled save now."""
+    global _save_pending, _save_timer
+    if _save_timer is not None:
+        if _root_frame:
+            _root_frame.after_cancel(_save_timer)
+        _save_timer = None
+    if not _save_pending:
+        return
+    _save_pending = False
+    _save_state()
+
+
+def _replay_progress():
+    """Apply visits logged since the last full save."""
+    try:
+        with open(PROGRESS_FILE, 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return
+    add_id = _state.visited_ids.add
+    add_name = _state.visited_names.add
+    discard = _state.pending_systems.discard
+    for line in lines:
+        try:
+            entry = _json_loads(line)
+        except ValueError:
+            continue  # torn final line from an interrupted append
+        name = _intern_name(entry['name'])
+        system_id = entry.get('id')
+        if system_id:
+            add_id(system_id)
+        add_name(name)
+        discard(name, system_id)
+
+
 def _load_state():
     """Load state from disk."""
-    if not os.path.exists(STATE_FILE):
+    try:
+        with open(STATE_FILE, 'rb') as f:
+            data = _json_loads(f.read())
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logger.error(f"Failed to load state: {e}")
         return
     
     try:
-        with open(STATE_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         _state.active = data.get('active', False)
         _state.start_system = data.get('start_system')
         coords = data.get('start_coords')
@@ -770,16 +1922,44 @@ def _load_state():
         _state.max_jump_ly = data.get('max_jump_ly')
         _state.prefer_short_jumps = data.get('prefer_short_jumps', True)
         
-        _state.pending_systems = [
-            SystemNode(**s) for s in data.get('pending_systems', [])
-        ]
-        _state.visited_ids = set(data.get('visited_ids', []))
-        _state.visited_names = set(data.get('visited_names', []))
-        _state.all_systems = {
-            name: SystemNode(**s) for name, s in data.get('all_systems', {}).items()
-        }
+        _state.visited_ids = SortedIdSet(data.get('visited_ids', []))
+        _state.visited_names = set(map(_intern_name, data.get('visited_names', [])))
+        _state.all_systems = {}
+        if 'all_systems' in data:
+            # Older state files kept every system in the JSON
+            _state.pending_systems = PendingSystems(
+                _node_from_row(s) for s in data.get('pending_systems', [])
+            )
+            all_systems = data['all_systems']
+            if isinstance(all_systems, dict):
+                all_systems = all_systems.values()
+            for row in all_systems:
+                node = _node_from_row(row)
+                _state.all_systems[node.name] = node
+        else:
+            pending = []
+            try:
+                with open(SYSTEMS_FILE, 'rb') as f:
+                    buf = f.read()
+            except FileNotFoundError:
+                buf = None
+            if buf:
+                # Metadata-only saves leave the pending flags behind the
+                # visited sets, so check those as well
+                visited_ids = _state.visited_ids
+                visited_names = _state.visited_names
+                for node, is_pending in _decode_systems(buf):
+                    _state.all_systems[node.name] = node
+                    if (is_pending and node.name not in visited_names
+                            and not (node.id64 and node.id64 in visited_ids)):
+                        pending.append(node)
+            _state.pending_systems = PendingSystems(pending)
         _state.started_ts = data.get('started_ts')
         _state.data_source_used = data.get('data_source_used')
+        _replay_progress()
+        _state.dirty = False
+        _state.systems_dirty = False
+        _state.visits = []
         
         logger.info(f"State loaded: {len(_state.pending_systems)} pending, {len(_state.visited_names)} visited")
     except Exception as e:
@@ -791,11 +1971,12 @@ def _load_state():
 
 def _update_current_location_from_monitor():
     """Update current location from EDMC monitor state."""
-    global _current_system, _current_system_id, _current_coords
+    global _current_system, _current_system_id, _current_coords, _last_monitor
     
     try:
-        from monitor import monitor
-        state = monitor.state
+        if _monitor is None:
+            return False
+        state = _monitor.state
         
         if not state:
             logger.debug("Monitor state is empty")
@@ -805,24 +1986,32 @@ def _update_current_location_from_monitor():
         system_id = state.get('SystemAddress')
         coords = state.get('StarPos')
         
+        # Dashboard updates arrive every few seconds; the monitor replaces
+        # StarPos on each jump, so an identical read means nothing moved
+        last = _last_monitor
+        if last and last[2] is coords and last[0] == system_name and last[1] == system_id:
+            return False
+        _last_monitor = (system_name, system_id, coords)
+        
         changed = False
         
         if system_name and system_name != _current_system:
             _current_system = system_name
             changed = True
-            logger.info(f"Current system from monitor: {system_name}")
+            logger.info("Current system from monitor: %s", system_name)
         
         if system_id and system_id != _current_system_id:
             _current_system_id = system_id
             changed = True
-            logger.info(f"Current system ID from monitor: {system_id}")
+            logger.info("Current system ID from monitor: %s", system_id)
         
         if coords and len(coords) >= 3:
-            new_coords = tuple(coords[:3])
-            if new_coords != _current_coords:
-                _current_coords = new_coords
+            cur = _current_coords
+            # Compare in place; only build a tuple when the position moved
+            if cur is None or coords[0] != cur[0] or coords[1] != cur[1] or coords[2] != cur[2]:
+                _current_coords = (coords[0], coords[1], coords[2])
                 changed = True
-                logger.info(f"Current coords from monitor: {_current_coords}")
+                logger.info("Current coords from monitor: %s", _current_coords)
         
         return changed
         
@@ -836,52 +2025,47 @@ def _update_current_location_from_monitor():
 
 def _get_next_target() -> Optional[SystemNode]:
     """Get next system to visit, preferring shortest jumps if configured."""
-    if not _state.pending_systems or not _current_coords:
+    global _target_cache
+    pending = _state.pending_systems
+    if not pending or not _current_coords:
         return None
     
-    if _state.prefer_short_jumps and _current_coords:
-        # Find nearest unvisited system from current position
-        cx, cy, cz = _current_coords
-        
-        def dist_from_current(sys: SystemNode) -> float:
-            dx = sys.x - cx
-            dy = sys.y - cy
-            dz = sys.z - cz
-            return math.sqrt(dx*dx + dy*dy + dz*dz)
-        
-        # Filter by jump range if available
-        candidates = _state.pending_systems
-        if _state.max_jump_ly:
-            candidates = [s for s in candidates if dist_from_current(s) <= _state.max_jump_ly]
+    # UI refreshes and journal events ask repeatedly with nothing changed
+    key = (pending, pending.version, _current_coords, _state.max_jump_ly, _state.prefer_short_jumps)
+    with _target_lock:
+        cache = _target_cache
+        if cache and cache[0] == key:
+            return cache[1]
         
-        if not candidates:
-            # No reachable systems, take closest even if out of range
-            candidates = _state.pending_systems
+        if _state.prefer_short_jumps:
+            # Find nearest unvisited system from current position, within jump
+            # range if possible, otherwise the closest even if out of range
+            cx, cy, cz = key[2]
+            target = pending.nearest(cx, cy, cz, _state.max_jump_ly)
+        else:
+            # Take next from queue (sorted by distance from start)
+            target = pending.closest_to_start()
         
-        # Sort by distance from current position
-        candidates.sort(key=dist_from_current)
-        return candidates[0] if candidates else None
-    else:
-        # Take next from queue (sorted by distance from start)
-        return _state.pending_systems[0] if _state.pending_systems else None
+        _target_cache = (key, target)
+        return target
 
 
 def _mark_visited(system_name: str, system_id: Optional[int] = None):
     """Mark a system as visited."""
+    system_name = _intern_name(system_name)
+    _state.visits.append((system_id, system_name))
     if system_id:
         _state.visited_ids.add(system_id)
     _state.visited_names.add(system_name)
     
     # Remove from pending
-    _state.pending_systems = [s for s in _state.pending_systems 
-                              if s.name != system_name and (not system_id or s.id64 != system_id)]
+    _state.pending_systems.discard(system_name, system_id)
     
     # Update UI
-    if _root_frame:
-        _root_frame.after(0, _refresh_ui)
+    _schedule_ui_update()
     
-    _save_state()
-    logger.info(f"Marked visited: {system_name} (ID: {system_id})")
+    _schedule_save()
+    logger.info("Marked visited: %s (ID: %s)", system_name, system_id)
 
 
 def _copy_to_clipboard(text: str):
@@ -894,14 +2078,35 @@ def _copy_to_clipboard(text: str):
         _root_frame.clipboard_clear()
         _root_frame.clipboard_append(text)
         _root_frame.update()
-        logger.info(f"✓ Copied to clipboard: {text}")
+        logger.info("✓ Copied to clipboard: %s", text)
     except Exception as e:
         logger.error(f"Clipboard copy failed: {e}", exc_info=True)
 
 
+def _schedule_clipboard_copy(text: str):
+    """Copy text after CLIPBOARD_DELAY_MS, replacing any copy still waiting."""
+    global _clipboard_timer
+    if not _root_frame:
+        return
+    if _clipboard_timer is not None:
+        _root_frame.after_cancel(_clipboard_timer)
+    _clipboard_timer = _root_frame.after(CLIPBOARD_DELAY_MS, _flush_clipboard_copy, text)
+
+
+def _flush_clipboard_copy(text: str):
+    global _clipboard_timer
+    _clipboard_timer = None
+    _copy_to_clipboard(text)
+
+
 def _start_survey():
     """Start a new survey."""
-    global _current_system, _current_coords
+    global _current_system, _current_coords, _query_thread
+    
+    # Repeated Start clicks share the query already running
+    if _query_thread is not None and _query_thread.is_alive():
+        logger.info("Survey query already running")
+        return
     
     # Try to get current location from monitor
     _update_current_location_from_monitor()
@@ -909,13 +2114,13 @@ def _start_survey():
     if not _current_system or not _current_coords:
         logger.error("Cannot start: no current system")
         if _status_var:
-            _status_var.set("Error: No current system detected")
-            _status_var.set("Error: Start Elite Dangerous first")
+            _set_var(_status_var, "Error: No current system detected")
+            _set_var(_status_var, "Error: Start Elite Dangerous first")
         return
     
     # Get config
-    radius = config.get_int(CFG_RADIUS) if hasattr(config, 'get_int') else int(config.get(CFG_RADIUS) or 50)
-    prefer_source = config.get_str(CFG_DATA_SOURCE) if hasattr(config, 'get_str') else config.get(CFG_DATA_SOURCE)
+    radius = _get_config_int(CFG_RADIUS, 50)
+    prefer_source = _get_config_str(CFG_DATA_SOURCE)
     
     # Reset state
     _state.reset()
@@ -924,7 +2129,7 @@ def _start_survey():
     _state.start_coords = _current_coords
     _state.radius_ly = radius
     _state.max_jump_ly = _current_max_jump
-    _state.prefer_short_jumps = config.get_bool(CFG_PREFER_SHORT_JUMPS) if hasattr(config, 'get_bool') else bool(config.get(CFG_PREFER_SHORT_JUMPS))
+    _state.prefer_short_jumps = _get_config_bool(CFG_PREFER_SHORT_JUMPS)
     _state.started_ts = time.time()
     
     # Query systems in background thread
@@ -935,46 +2140,49 @@ def _start_survey():
         if not systems:
             logger.error("No systems found")
             if _status_var:
-                _root_frame.after(0, lambda: _status_var.set("Error: No systems found"))
+                _root_frame.after(0, lambda: _set_var(_status_var, "Error: No systems found"))
             _state.reset()
             return
         
         # Store all systems
         _state.all_systems = {s.name: s for s in systems}
-        _state.pending_systems = list(systems)
         _state.data_source_used = source_name
         
         # Mark start system as visited
-        _state.visited_names.add(_current_system)
+        _state.visited_names.add(_intern_name(_current_system))
         if _current_system_id:
             _state.visited_ids.add(_current_system_id)
         
-        _state.pending_systems = [s for s in _state.pending_systems if s.name != _current_system]
+        start = _current_system
+        _state.pending_systems = PendingSystems(s for s in systems if s.name != start)
+        _state.dirty = True
+        _state.systems_dirty = True
         
         _save_state()
         
         # Update UI and copy first target
         if _root_frame:
-            _root_frame.after(0, _refresh_ui)
+            _schedule_ui_update()
             target = _get_next_target()
-            autocopy_enabled = _get_config_bool(CFG_AUTOCOPY, True)
-            logger.info(f"Auto-copy enabled: {autocopy_enabled}, Target: {target.name if target else None}")
-            if target and autocopy_enabled:
+            logger.info(f"Auto-copy enabled: {_autocopy_enabled}, Target: {target.name if target else None}")
+            if target and _autocopy_enabled:
                 logger.info(f"Scheduling clipboard copy for: {target.name}")
                 _root_frame.after(0, lambda: _copy_to_clipboard(target.name))
         
         logger.info(f"Survey started: {len(systems)} systems from {source_name}")
     
-    thread = threading.Thread(target=query_systems, daemon=True)
-    thread.start()
+    _query_thread = threading.Thread(target=query_systems, daemon=True)
+    _query_thread.start()
     
     if _status_var:
-        _status_var.set("Loading systems...")
+        _set_var(_status_var, "Loading systems...")
 
 
 def _stop_survey():
     """Stop current survey."""
-    _state.active = False
+    if _state.active:
+        _state.active = False
+        _state.dirty = True
     _save_state()
     _refresh_ui()
     logger.info("Survey stopped")
@@ -982,9 +2190,19 @@ def _stop_survey():
 
 def _reset_survey():
     """Reset survey state."""
+    global _target_cache
     _state.reset()
-    if os.path.exists(STATE_FILE):
-        os.remove(STATE_FILE)
+    _target_cache = ()  # don't keep the old survey's systems alive
+    # A snapshot still waiting for the writer would bring the old survey back
+    try:
+        _writer_queue.get_nowait()
+    except queue.Empty:
+        pass
+    for path in (STATE_FILE, SYSTEMS_FILE, PROGRESS_FILE):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
     _refresh_ui()
     logger.info("Survey reset")
 
@@ -997,19 +2215,50 @@ def _return_to_start():
     if _current_system == _state.start_system:
         logger.info("Already at start system")
         if _status_var:
-            _status_var.set("Already at start system")
+            _set_var(_status_var, "Already at start system")
         return
     
     # Copy start system name to clipboard
     _copy_to_clipboard(_state.start_system)
     if _status_var:
-        _status_var.set(f"Return to: {_state.start_system}")
+        _set_var(_status_var, f"Return to: {_state.start_system}")
     logger.info(f"Returning to start: {_state.start_system}")
 
 # ============================================================================
 # UI Functions
 # ============================================================================
 
+_var_text: Dict[str, str] = {}  # last text given to _set_var, by Tcl variable name
+
+
+def _set_var(var: tk.StringVar, value: str):
+    """Set a StringVar only if its text changes; set() always fires traces and a redraw.
+    
+    The last text is remembered here, so an unchanged value costs no Tcl call.
+    """
+    name = str(var)
+    if _var_text.get(name) != value:
+        var.set(value)
+        _var_text[name] = value
+
+
+def _schedule_ui_update():
+    """Refresh the UI shortly; a burst of events shares one refresh."""
+    global _ui_update_pending
+    if not _root_frame or _ui_update_pending:
+        return
+    _ui_update_pending = True
+    _root_frame.after(UI_UPDATE_DELAY_MS, _do_ui_update)
+
+
+def _do_ui_update():
+    global _ui_update_pending
+    _ui_update_pending = False
+    if _root_frame and hasattr(_root_frame, 'current_var'):
+        _set_var(_root_frame.current_var, _current_system or "Unknown")
+    _refresh_ui()
+
+
 def _refresh_ui():
     """Update all UI elements."""
     if not _root_frame:
@@ -1018,20 +2267,17 @@ def _refresh_ui():
     try:
         # Status
         if _status_var:
-            if _state.active:
-                _status_var.set("Survey Active")
-            else:
-                _status_var.set("Inactive")
+            _set_var(_status_var, "Survey Active" if _state.active else "Inactive")
         
         # Target
         if _target_var:
             target = _get_next_target()
             if target:
-                _target_var.set(target.name)
+                _set_var(_target_var, target.name)
             elif _state.active and not _state.pending_systems:
-                _target_var.set("Survey Complete!")
+                _set_var(_target_var, "Survey Complete!")
             else:
-                _target_var.set("-")
+                _set_var(_target_var, "-")
         
         # Progress
         if _progress_var:
@@ -1039,16 +2285,16 @@ def _refresh_ui():
                 total = len(_state.all_systems)
                 visited = len(_state.visited_names)
                 pending = len(_state.pending_systems)
-                _progress_var.set(f"{visited}/{total} visited, {pending} pending")
+                _set_var(_progress_var, f"{visited}/{total} visited, {pending} pending")
             else:
-                _progress_var.set("-")
+                _set_var(_progress_var, "-")
         
         # Source status
         if _source_status_var:
             if _state.data_source_used:
-                _source_status_var.set(f"Source: {_state.data_source_used}")
+                _set_var(_source_status_var, f"Source: {_state.data_source_used}")
             else:
-                _source_status_var.set("No data source")
+                _set_var(_source_status_var, "No data source")
     except Exception as e:
         logger.error(f"UI refresh failed: {e}")
 
@@ -1071,6 +2317,7 @@ def plugin_start3(plugin_dir: str) -> str:
         config.set(CFG_PREFER_SHORT_JUMPS, True)
     if config.get(CFG_RADIUS) is None:
         config.set(CFG_RADIUS, 50)
+    _refresh_cached_flags()
     
     # Auto-load neareststars.json from plugin folder if present
     auto_json = os.path.join(plugin_dir, 'neareststars.json')
@@ -1083,13 +2330,19 @@ def plugin_start3(plugin_dir: str) -> str:
             config.set(CFG_LOCAL_PATH, auto_json)
     
     _load_state()
+    _start_writer()
     logger.info(f"Plugin started v{VERSION}")
     return f"EDMC_SphereSurvey v{VERSION}"
 
 
 def plugin_stop():
     """Plugin shutdown."""
-    _save_state()
+    global _save_pending
+    # Always write once and wait for it; daemon threads die with EDMC
+    _save_pending = True
+    _flush_save()
+    _stop_writer()
+    _data_manager.close()
     logger.info("Plugin stopped")
 
 
@@ -1142,12 +2395,12 @@ def plugin_app(parent: tk.Frame) -> tk.Frame:
         """Manually detect current system."""
         if _update_current_location_from_monitor():
             if _root_frame.current_var:
-                _root_frame.current_var.set(_current_system or "Unknown")
+                _set_var(_root_frame.current_var, _current_system or "Unknown")
             if _status_var:
-                _status_var.set(f"Detected: {_current_system}")
+                _set_var(_status_var, f"Detected: {_current_system}")
         else:
             if _status_var:
-                _status_var.set("Cannot detect system - Start Elite!")
+                _set_var(_status_var, "Cannot detect system - Start Elite!")
     
     tk.Button(btn_frame, text="Detect", command=detect_system).pack(side=tk.LEFT, padx=2)
     tk.Button(btn_frame, text="Start", command=_start_survey).pack(side=tk.LEFT, padx=2)
@@ -1160,7 +2413,7 @@ def plugin_app(parent: tk.Frame) -> tk.Frame:
     # Initial detection
     _update_current_location_from_monitor()
     if _root_frame.current_var:
-        _root_frame.current_var.set(_current_system or "Unknown")
+        _set_var(_root_frame.current_var, _current_system or "Unknown")
     
     _refresh_ui()
     
@@ -1198,7 +2451,7 @@ def plugin_prefs(parent: nb.Notebook, cmdr: str, is_beta: bool) -> Optional[tk.F
     
     # Radius
     nb.Label(frame, text="Default radius (ly):").grid(row=row, column=0, sticky=tk.W)
-    radius_var = tk.StringVar(value=str(config.get_int(CFG_RADIUS) if hasattr(config, 'get_int') else config.get(CFG_RADIUS) or 50))
+    radius_var = tk.StringVar(value=str(_get_config_int(CFG_RADIUS, 50)))
     
     def save_radius(*args):
         try:
@@ -1213,7 +2466,7 @@ def plugin_prefs(parent: nb.Notebook, cmdr: str, is_beta: bool) -> Optional[tk.F
     
     # Jump range  
     nb.Label(frame, text="Max jump range (ly):").grid(row=row, column=0, sticky=tk.W)
-    jump_var = tk.StringVar(value=str(config.get_int(CFG_JUMP_RANGE) if hasattr(config, 'get_int') else config.get(CFG_JUMP_RANGE) or 65))
+    jump_var = tk.StringVar(value=str(_get_config_int(CFG_JUMP_RANGE, 65)))
     
     def save_jump(*args):
         try:
@@ -1228,7 +2481,7 @@ def plugin_prefs(parent: nb.Notebook, cmdr: str, is_beta: bool) -> Optional[tk.F
     
     # Data source
     nb.Label(frame, text="Preferred data source:").grid(row=row, column=0, sticky=tk.W)
-    source_var = tk.StringVar(value=config.get_str(CFG_DATA_SOURCE) if hasattr(config, 'get_str') else config.get(CFG_DATA_SOURCE) or 'auto')
+    source_var = tk.StringVar(value=_get_config_str(CFG_DATA_SOURCE, 'auto'))
     
     def save_source(*args):
         config.set(CFG_DATA_SOURCE, source_var.get())
@@ -1240,7 +2493,7 @@ def plugin_prefs(parent: nb.Notebook, cmdr: str, is_beta: bool) -> Optional[tk.F
     
     # Local JSON path
     nb.Label(frame, text="Local JSON file:").grid(row=row, column=0, sticky=tk.W)
-    path_var = tk.StringVar(value=config.get_str(CFG_LOCAL_PATH) if hasattr(config, 'get_str') else config.get(CFG_LOCAL_PATH) or '')
+    path_var = tk.StringVar(value=_get_config_str(CFG_LOCAL_PATH))
     
     def save_path(*args):
         config.set(CFG_LOCAL_PATH, path_var.get())
@@ -1289,6 +2542,7 @@ def prefs_changed(cmdr: str, is_beta: bool) -> None:
     """Save preference changes."""
     try:
         # Config values are stored directly, not via frame reference
+        _refresh_cached_flags()
         logger.info("Preferences saved")
     except Exception as e:
         logger.error(f"Failed to save preferences: {e}")
@@ -1303,15 +2557,14 @@ def dashboard_entry(cmdr: str, is_beta: bool, entry: dict) -> None:
         _update_current_location_from_monitor()
         
         # Update UI with current system
-        if _root_frame and hasattr(_root_frame, 'current_var'):
-            _root_frame.after(0, lambda: _root_frame.current_var.set(_current_system or "Unknown"))
+        _schedule_ui_update()
         
         # Get ship jump range from dashboard
         if 'FuelCapacity' in entry:
             fuel_cap = entry['FuelCapacity'].get('Main', 0)
             if fuel_cap > 0 and _current_max_jump is None:
                 _current_max_jump = fuel_cap * 2.0
-                logger.info(f"Jump range estimate from dashboard: {_current_max_jump:.2f} ly")
+                logger.info("Jump range estimate from dashboard: %.2f ly", _current_max_jump)
     except Exception as e:
         logger.error(f"Error in dashboard_entry: {e}")
 
@@ -1337,13 +2590,9 @@ def journal_entry(
             
             coords = entry.get("StarPos")
             if coords and len(coords) >= 3:
-                _current_coords = tuple(coords[:3])
+                _current_coords = (coords[0], coords[1], coords[2])
             
-            logger.info(f"Location update: {_current_system} @ {_current_coords}")
-            
-            # Update UI
-            if _root_frame and hasattr(_root_frame, 'current_var'):
-                _root_frame.after(0, lambda: _root_frame.current_var.set(_current_system or "Unknown"))
+            logger.info("Location update: %s @ %s", _current_system, _current_coords)
             
             # Mark visited if in survey
             if _state.active and _current_system:
@@ -1351,29 +2600,29 @@ def journal_entry(
                 
                 # Copy next target to clipboard
                 target = _get_next_target()
-                autocopy_enabled = _get_config_bool(CFG_AUTOCOPY, True)
-                logger.info(f"After jump - Auto-copy: {autocopy_enabled}, Next target: {target.name if target else 'None'}")
-                if target and autocopy_enabled:
+                logger.info("After jump - Auto-copy: %s, Next target: %s", _autocopy_enabled, target.name if target else 'None')
+                if target and _autocopy_enabled:
                     # Delayed copy to handle rapid jumps
-                    logger.info(f"Scheduling delayed clipboard copy for: {target.name}")
-                    if _root_frame:
-                        _root_frame.after(1500, lambda: _copy_to_clipboard(target.name))
+                    logger.info("Scheduling delayed clipboard copy for: %s", target.name)
+                    _schedule_clipboard_copy(target.name)
             
-            if _root_frame:
-                _root_frame.after(0, _refresh_ui)
+            _schedule_ui_update()
         
         # Ship loadout for jump range
         elif event == "Loadout":
             max_jump = entry.get("MaxJumpRange", 0)
             if max_jump > 0:
                 _current_max_jump = max_jump
-                logger.info(f"Jump range updated: {max_jump:.2f} ly")
-        
+                logger.info("Jump range updated: %.2f ly", max_jump)
+
+        # Game closing: don't leave the last jumps waiting on the save timer
+        elif event == "Shutdown":
+            _flush_save()
+
     except Exception as e:
         logger.error(f"Error in journal_entry: {e}", exc_info=True)
     
     # Always try to update from monitor as backup
     if not _current_system:
         _update_current_location_from_monitor()
-        if _root_frame and hasattr(_root_frame, 'current_var'):
-            _root_frame.after(0, lambda: _root_frame.current_var.set(_current_system or "Unknown"))
\ No newline at end of file
+        _schedule_ui_update()
\ No newline at end of file